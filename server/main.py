@@ -7,19 +7,25 @@ Single behavior per inference.
 """
 
 import os
+import sys
 import json
 import uuid
+import asyncio
 import hashlib
 import time
-import threading
 import random
+import zlib
 from pathlib import Path
-from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Literal
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+import aiofiles
+import orjson
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 # Configuration
@@ -33,7 +39,26 @@ LABEL_MAP_PATH = ASSETS_DIR / "label_map.json"
 
 # Environment variables
 DUMMY_MODE = os.environ.get("DIANA_DUMMY_MODE", "0") == "1"
+# Seconds each simulated stage takes in dummy mode (0 disables the delay)
+DUMMY_STAGE_DELAY = float(os.environ.get("DIANA_DUMMY_STAGE_DELAY", "0.4"))
 MODEL_PATH = MODELS_DIR / "model.onnx"
+# Checked once; dropping in a model requires a server restart
+_MODEL_AVAILABLE = MODEL_PATH.exists() and not DUMMY_MODE
+# Optional Redis job store, shared across uvicorn workers
+REDIS_URL = os.environ.get("DIANA_REDIS_URL")
+JOB_TTL_SECONDS = 24 * 60 * 60
+
+# Block size for file hashing fallback (Python < 3.11)
+HASH_CHUNK_SIZE = 1 << 20
+# Block size for streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+# Bytes read from head, middle and tail of a video to fingerprint it
+FINGERPRINT_SAMPLE_SIZE = 1 << 20
+# Supported video container extensions, in lookup order
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm")
+_ALLOWED_VIDEO_EXT = frozenset(VIDEO_EXTENSIONS)
+# Keys under a skeleton's "data" that may hold its frames, in priority order
+SKELETON_FRAME_KEYS = ("data", "keypoints", "frames", "skeleton")
 
 # Create directories
 UPLOADS_DIR.mkdir(exist_ok=True)
@@ -41,19 +66,46 @@ SKELETONS_DIR.mkdir(exist_ok=True)
 RUNS_DIR.mkdir(exist_ok=True)
 MODELS_DIR.mkdir(exist_ok=True)
 
-# In-memory job storage (for MVP - use Redis/DB in production)
-jobs: dict = {}
-jobs_lock = threading.Lock()
+# Running inference tasks; holding a reference keeps them from being
+# garbage-collected before they finish
+inference_tasks: set = set()
+
+# Fingerprint of each uploaded video, computed once at upload time
+video_hashes: dict = {}
+
+# Stored path of each uploaded video, rebuilt from disk on startup
+video_paths: dict = {
+    p.stem: p for p in UPLOADS_DIR.iterdir() if p.suffix in _ALLOWED_VIDEO_EXT
+}
+
+def load_json(path: Path):
+    """Load a JSON file; orjson parses the raw bytes without a text decode."""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
 
 # Load label map
 def load_label_map() -> dict:
     if LABEL_MAP_PATH.exists():
-        with open(LABEL_MAP_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json(LABEL_MAP_PATH)
     return {}
 
 LABEL_MAP = load_label_map()
-BEHAVIOR_IDS = list(LABEL_MAP.keys())
+BEHAVIOR_IDS = tuple(LABEL_MAP.keys())
+_BEHAVIOR_SET = frozenset(BEHAVIOR_IDS)
+
+# (labels, labels_es) rubric texts per behavior, flattened once at startup
+_BEHAVIOR_CACHE: dict[str, tuple[dict[str, str], dict[str, str]]] = {
+    behavior_id: (behavior.get("labels", {}), behavior.get("labels_es", {}))
+    for behavior_id, behavior in LABEL_MAP.items()
+}
+
+# /api/behaviors never changes while running; serialize it once
+_BEHAVIORS_PAYLOAD = orjson.dumps({
+    "behaviors": LABEL_MAP,
+    "count": len(BEHAVIOR_IDS),
+    "ids": BEHAVIOR_IDS,
+})
 
 
 # ============================================
@@ -68,6 +120,7 @@ class VideoUploadResponse(BaseModel):
 
 
 class SkeletonUploadRequest(BaseModel):
+    """Skeleton upload body (documentation only; parsed by scan_skeleton_upload)."""
     filename: str
     data: dict
 
@@ -119,23 +172,168 @@ class JobResultsResponse(BaseModel):
     metadata: InferenceMetadata
 
 
+# ============================================
+# Job Storage
+# ============================================
+
+class MemoryJobStore:
+    """
+    In-process job storage (default).
+    Only reachable from the event loop thread, so no locking is needed.
+    Jobs are lost on restart and not shared between workers.
+    """
+
+    def __init__(self):
+        self._jobs: dict = {}
+
+    async def create(self, job_id: str, job: dict) -> None:
+        self._jobs[job_id] = job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def update(self, job_id: str, fields: dict) -> None:
+        self._jobs[job_id].update(fields)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobStore:
+    """
+    Redis-backed job storage, one hash per job with a sliding TTL.
+    Each field value is stored orjson-encoded.
+    """
+
+    def __init__(self, client):
+        self._redis = client
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    async def _write(self, job_id: str, fields: dict) -> None:
+        key = self._key(job_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={k: orjson.dumps(v) for k, v in fields.items()})
+            pipe.expire(key, JOB_TTL_SECONDS)
+            await pipe.execute()
+
+    async def create(self, job_id: str, job: dict) -> None:
+        await self._write(job_id, job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await self._redis.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        return {k.decode(): orjson.loads(v) for k, v in raw.items()}
+
+    async def update(self, job_id: str, fields: dict) -> None:
+        await self._write(job_id, fields)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def create_job_store():
+    """Use Redis when DIANA_REDIS_URL is set, otherwise keep jobs in memory."""
+    if REDIS_URL:
+        import redis.asyncio as aioredis
+        return RedisJobStore(aioredis.Redis.from_url(REDIS_URL))
+    return MemoryJobStore()
+
+
+job_store = create_job_store()
+
+
 # ============================================
 # Helper Functions
 # ============================================
 
+@lru_cache(maxsize=1)
+def _format_utc_seconds(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def utcnow_iso() -> str:
+    """
+    Current UTC time as ISO 8601 with milliseconds, e.g. 2024-01-01T12:00:00.123Z.
+    Calls within the same second reuse the formatted date/time prefix.
+    """
+    now = time.time()
+    seconds = int(now)
+    return f"{_format_utc_seconds(seconds)}.{int((now - seconds) * 1000):03d}Z"
+
+
 def compute_file_hash(file_path: Path) -> str:
     """Compute SHA256 hash of file."""
-    sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256.update(chunk)
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: read/update loop runs in C
+            return hashlib.file_digest(f, "sha256").hexdigest()[:16]
+        # Reuse one buffer; the memoryview slice avoids copying short reads
+        sha256 = hashlib.sha256()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while (n := f.readinto(buf)) > 0:
+            sha256.update(view[:n])
     return sha256.hexdigest()[:16]
 
 
-def compute_data_hash(data: dict) -> str:
-    """Compute hash of data dictionary."""
-    json_str = json.dumps(data, sort_keys=True)
-    return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+def compute_fingerprint(file_path: Path) -> str:
+    """
+    Compute a content fingerprint of a video without reading all of it.
+    Hashes the file size plus samples from the head, middle and tail;
+    small files are hashed in full.
+    """
+    size = file_path.stat().st_size
+    if size < 4 * FINGERPRINT_SAMPLE_SIZE:
+        return compute_file_hash(file_path)
+    
+    sha256 = hashlib.sha256(size.to_bytes(8, "little"))
+    buf = bytearray(FINGERPRINT_SAMPLE_SIZE)
+    view = memoryview(buf)
+    with open(file_path, "rb") as f:
+        for offset in (0, size // 2, size - FINGERPRINT_SAMPLE_SIZE):
+            f.seek(offset)
+            n = f.readinto(buf)
+            sha256.update(view[:n])
+    return sha256.hexdigest()[:16]
+
+
+def scan_skeleton_upload(body: bytes) -> tuple[Optional[str], bool, int]:
+    """
+    Parse a skeleton upload body and extract its filename and frame count.
+    Returns (filename, data_is_object, frame_count).
+    
+    Supports multiple skeleton JSON formats under "data":
+    - OpenPose format: {"data": [{"frame_index": 1, "skeleton": [...]}, ...]}
+    - Alternative formats: {"keypoints": [...]}, {"frames": [...]}, {"skeleton": [...]}
+    Raises ValueError on malformed JSON.
+    """
+    try:
+        upload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        # orjson rejects NaN/Infinity, which pose exporters emit for missing
+        # keypoints and stdlib json (FastAPI's body parser) accepts
+        upload = json.loads(body)
+    if not isinstance(upload, dict):
+        return None, False, 0
+    
+    filename = upload.get("filename")
+    if not isinstance(filename, str):
+        filename = None
+    
+    data = upload.get("data")
+    if not isinstance(data, dict):
+        return filename, False, 0
+    
+    frame_count = next(
+        (len(data[key]) for key in SKELETON_FRAME_KEYS if isinstance(data.get(key), list)),
+        0,
+    )
+    return filename, True, frame_count
 
 
 def get_video_info(file_path: Path) -> tuple[float, float]:
@@ -148,18 +346,12 @@ def get_video_info(file_path: Path) -> tuple[float, float]:
     return 30.0, 30.0  # duration, fps
 
 
-def is_model_available() -> bool:
-    """Check if inference model is available."""
-    return MODEL_PATH.exists() and not DUMMY_MODE
-
-
 def generate_dummy_prediction(behavior_id: str, input_hash: str) -> dict:
     """Generate realistic mock prediction for a single behavior."""
-    random.seed(hash(f"{behavior_id}_{input_hash}"))  # Deterministic
+    # Deterministic across restarts and workers, unlike salted str hash()
+    random.seed(int(input_hash, 16) ^ zlib.crc32(behavior_id.encode()))
     
-    behavior = LABEL_MAP.get(behavior_id, {})
-    labels = behavior.get("labels", {})
-    labels_es = behavior.get("labels_es", {})
+    labels, labels_es = _BEHAVIOR_CACHE.get(behavior_id, ({}, {}))
     
     # Generate realistic score with some variation
     pred = random.choices([0, 1, 2], weights=[0.2, 0.35, 0.45])[0]
@@ -174,7 +366,23 @@ def generate_dummy_prediction(behavior_id: str, input_hash: str) -> dict:
     }
 
 
-def run_inference(
+def save_run_artifacts(run_dir: Path, results: dict) -> None:
+    """
+    Write results.json for a finished job (run metadata included).
+    The payload is compact JSON written through one unbuffered os.write.
+    """
+    run_dir.mkdir(exist_ok=True)
+    
+    payload = memoryview(orjson.dumps(results))
+    fd = os.open(run_dir / "results.json", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while payload:
+            payload = payload[os.write(fd, payload):]
+    finally:
+        os.close(fd)
+
+
+async def run_inference(
     input_path: Path,
     input_type: str,
     behavior_id: str,
@@ -184,21 +392,26 @@ def run_inference(
     """
     Run inference for a single behavior.
     Supports both video and skeleton inputs.
+    Runs as a task on the event loop; blocking file I/O goes to the threadpool.
     """
     try:
+        job = await job_store.get(job_id)
+        
         # Update job status
-        with jobs_lock:
-            jobs[job_id]["status"] = "processing"
-            jobs[job_id]["message"] = "Iniciando procesamiento..."
-            jobs[job_id]["progress"] = 5
+        await job_store.update(job_id, {
+            "status": "processing",
+            "message": "Iniciando procesamiento...",
+            "progress": 5,
+        })
 
         # Compute input hash
         if input_type == "video":
-            input_hash = compute_file_hash(input_path)
+            input_hash = video_hashes.get(input_id)
+            if input_hash is None:
+                # Uploaded before this process started
+                input_hash = await run_in_threadpool(compute_fingerprint, input_path)
         else:
-            with open(input_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            input_hash = compute_data_hash(data)
+            input_hash = await run_in_threadpool(compute_file_hash, input_path)
         
         # Simulate processing stages
         stages = [
@@ -209,21 +422,30 @@ def run_inference(
             (90, "Generando predicción..."),
         ]
         
+        # Only dummy mode simulates processing time; a real model
+        # provides its own latency
+        stage_delay = 0 if _MODEL_AVAILABLE else DUMMY_STAGE_DELAY
+        
         for progress, message in stages:
-            with jobs_lock:
-                jobs[job_id]["progress"] = progress
-                jobs[job_id]["message"] = message
-            time.sleep(0.4)  # Simulate processing time
+            await job_store.update(job_id, {
+                "progress": progress,
+                "message": message,
+            })
+            if stage_delay > 0:
+                await asyncio.sleep(stage_delay)
         
         # Generate prediction (dummy or real)
-        if is_model_available():
-            # TODO: Implement real model inference
+        if _MODEL_AVAILABLE:
+            # TODO: Implement real model inference; run it with
+            # loop.run_in_executor on a ProcessPoolExecutor so it
+            # neither blocks the loop nor holds the GIL
             prediction = generate_dummy_prediction(behavior_id, input_hash)
         else:
             prediction = generate_dummy_prediction(behavior_id, input_hash)
         
         # Prepare results
-        model_version = "dummy-v1.0" if not is_model_available() else "diana-v1.0"
+        model_version = "dummy-v1.0" if not _MODEL_AVAILABLE else "diana-v1.0"
+        completed_at = utcnow_iso()
         
         results = {
             "job_id": job_id,
@@ -234,59 +456,68 @@ def run_inference(
             "metadata": {
                 "model_version": model_version,
                 "input_hash": input_hash,
-                "processed_at": datetime.utcnow().isoformat() + "Z",
+                "processed_at": completed_at,
+                # Run details; stored with the job but dropped from API
+                # responses, since InferenceMetadata ignores extra keys
+                "input_path": str(input_path),
+                "started_at": job.get("created_at"),
+                "completed_at": completed_at,
+                "dummy_mode": not _MODEL_AVAILABLE,
             }
         }
         
         # Save results to disk
-        run_dir = RUNS_DIR / job_id
-        run_dir.mkdir(exist_ok=True)
-        
-        with open(run_dir / "results.json", "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        
-        # Save metadata
-        metadata = {
-            "job_id": job_id,
-            "input_id": input_id,
-            "input_type": input_type,
-            "behavior_id": behavior_id,
-            "input_path": str(input_path),
-            "input_hash": input_hash,
-            "model_version": model_version,
-            "started_at": jobs[job_id].get("created_at"),
-            "completed_at": datetime.utcnow().isoformat() + "Z",
-            "dummy_mode": not is_model_available(),
-        }
-        
-        with open(run_dir / "metadata.json", "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        await run_in_threadpool(save_run_artifacts, RUNS_DIR / job_id, results)
         
         # Update job as completed
-        with jobs_lock:
-            jobs[job_id]["status"] = "completed"
-            jobs[job_id]["progress"] = 100
-            jobs[job_id]["message"] = "Análisis completado"
-            jobs[job_id]["results"] = results
+        await job_store.update(job_id, {
+            "status": "completed",
+            "progress": 100,
+            "message": "Análisis completado",
+            "results": results,
+        })
             
+    except asyncio.CancelledError:
+        # Server shutting down; don't leave the job "processing"
+        await job_store.update(job_id, {
+            "status": "failed",
+            "error": "cancelled",
+            "message": "Error: procesamiento cancelado",
+        })
+        raise
     except Exception as e:
-        with jobs_lock:
-            jobs[job_id]["status"] = "failed"
-            jobs[job_id]["error"] = str(e)
-            jobs[job_id]["message"] = f"Error: {str(e)}"
+        await job_store.update(job_id, {
+            "status": "failed",
+            "error": str(e),
+            "message": f"Error: {str(e)}",
+        })
 
 
 # ============================================
 # FastAPI App
 # ============================================
 
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson instead of the stdlib encoder.
+    Only for routes without a response_model: those already go straight
+    from Pydantic to JSON, and a custom response class disables that.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("=" * 50)
     print("DIANA Inference Tool - Backend Server")
     print("=" * 50)
-    print(f"Dummy Mode: {'ENABLED' if DUMMY_MODE or not MODEL_PATH.exists() else 'DISABLED'}")
+    print(f"Dummy Mode: {'ENABLED' if not _MODEL_AVAILABLE else 'DISABLED'}")
     print(f"Model Path: {MODEL_PATH}")
     print(f"Model Available: {MODEL_PATH.exists()}")
     print(f"Uploads Dir: {UPLOADS_DIR}")
@@ -294,10 +525,16 @@ async def lifespan(app: FastAPI):
     print(f"Runs Dir: {RUNS_DIR}")
     print(f"Behaviors Loaded: {len(BEHAVIOR_IDS)}")
     print(f"Behaviors: {', '.join(BEHAVIOR_IDS)}")
+    print(f"Job Store: {'Redis' if REDIS_URL else 'in-memory'}")
     print("=" * 50)
     yield
     # Shutdown
     print("Shutting down server...")
+    # Cancel unfinished jobs while the job store can still record them
+    for task in inference_tasks:
+        task.cancel()
+    await asyncio.gather(*inference_tasks, return_exceptions=True)
+    await job_store.close()
 
 
 app = FastAPI(
@@ -326,14 +563,14 @@ app.add_middleware(
 # API Endpoints
 # ============================================
 
-@app.get("/api/health")
+@app.get("/api/health", response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "model_available": is_model_available(),
-        "dummy_mode": DUMMY_MODE or not MODEL_PATH.exists(),
+        "timestamp": utcnow_iso(),
+        "model_available": _MODEL_AVAILABLE,
+        "dummy_mode": not _MODEL_AVAILABLE,
         "behaviors_count": len(BEHAVIOR_IDS),
         "behaviors": BEHAVIOR_IDS,
     }
@@ -349,12 +586,11 @@ async def upload_video(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="No filename provided")
     
     # Validate file type
-    allowed_extensions = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
     ext = Path(file.filename).suffix.lower()
-    if ext not in allowed_extensions:
+    if ext not in _ALLOWED_VIDEO_EXT:
         raise HTTPException(
             status_code=400, 
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
+            detail=f"Invalid file type. Allowed: {', '.join(VIDEO_EXTENSIONS)}"
         )
     
     # Generate video ID
@@ -364,12 +600,18 @@ async def upload_video(file: UploadFile = File(...)):
     file_path = UPLOADS_DIR / f"{video_id}{ext}"
     
     try:
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        # Stream to disk so the whole video is never held in memory;
+        # aiofiles runs each write in a thread to keep the loop free
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
     except Exception as e:
+        file_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
+    video_paths[video_id] = file_path
+    video_hashes[video_id] = await run_in_threadpool(compute_fingerprint, file_path)
+    
     # Get video info
     duration, fps = get_video_info(file_path)
     
@@ -381,12 +623,36 @@ async def upload_video(file: UploadFile = File(...)):
     )
 
 
-@app.post("/api/skeletons", response_model=SkeletonUploadResponse)
-async def upload_skeleton(request: SkeletonUploadRequest):
+@app.post(
+    "/api/skeletons",
+    response_model=SkeletonUploadResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": SkeletonUploadRequest.model_json_schema()}},
+            "required": True,
+        },
+    },
+)
+async def upload_skeleton(request: Request):
     """
     Upload skeleton points data (JSON).
     Returns skeleton_id and metadata.
+    The body is parsed off the event loop for validation and the frame
+    count, then stored verbatim rather than re-serialized.
     """
+    body = await request.body()
+    
+    try:
+        filename, data_is_object, frame_count = await run_in_threadpool(scan_skeleton_upload, body)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON: {str(e)}")
+    
+    if filename is None or not data_is_object:
+        raise HTTPException(
+            status_code=422,
+            detail="Body must be an object with a 'filename' string and a 'data' object",
+        )
+    
     # Generate skeleton ID
     skeleton_id = str(uuid.uuid4())
     
@@ -394,31 +660,11 @@ async def upload_skeleton(request: SkeletonUploadRequest):
     file_path = SKELETONS_DIR / f"{skeleton_id}.json"
     
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump({
-                "filename": request.filename,
-                "data": request.data,
-                "uploaded_at": datetime.utcnow().isoformat() + "Z",
-            }, f, indent=2)
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(body)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save skeleton data: {str(e)}")
     
-    # Try to extract frame count from data
-    # Supports multiple skeleton JSON formats:
-    # - OpenPose format: {"data": [{"frame_index": 1, "skeleton": [...]}, ...]}
-    # - Alternative formats: {"keypoints": [...]}, {"frames": [...]}, {"skeleton": [...]}
-    frame_count = 0
-    data = request.data
-    if "data" in data and isinstance(data["data"], list):
-        # OpenPose format: data contains array of frame objects
-        frame_count = len(data["data"])
-    elif "keypoints" in data and isinstance(data["keypoints"], list):
-        frame_count = len(data["keypoints"])
-    elif "frames" in data and isinstance(data["frames"], list):
-        frame_count = len(data["frames"])
-    elif "skeleton" in data and isinstance(data["skeleton"], list):
-        frame_count = len(data["skeleton"])
-    
     return SkeletonUploadResponse(
         skeleton_id=skeleton_id,
         stored_path=str(file_path),
@@ -428,7 +674,7 @@ async def upload_skeleton(request: SkeletonUploadRequest):
 
 
 @app.post("/api/infer", response_model=InferenceResponse)
-async def start_inference(request: InferenceRequest, background_tasks: BackgroundTasks):
+async def start_inference(request: InferenceRequest):
     """
     Start inference job for a single behavior.
     Supports both video and skeleton inputs.
@@ -439,7 +685,7 @@ async def start_inference(request: InferenceRequest, background_tasks: Backgroun
     behavior_id = request.behavior_id
     
     # Validate behavior_id
-    if behavior_id not in BEHAVIOR_IDS:
+    if behavior_id not in _BEHAVIOR_SET:
         raise HTTPException(
             status_code=400, 
             detail=f"Invalid behavior_id. Valid options: {', '.join(BEHAVIOR_IDS)}"
@@ -448,11 +694,14 @@ async def start_inference(request: InferenceRequest, background_tasks: Backgroun
     # Find input file
     input_path = None
     if input_type == "video":
-        for ext in [".mp4", ".mov", ".avi", ".mkv", ".webm"]:
-            candidate = UPLOADS_DIR / f"{input_id}{ext}"
-            if candidate.exists():
-                input_path = candidate
-                break
+        input_path = video_paths.get(input_id)
+        if input_path is None:
+            # Uploaded through another worker process
+            for ext in VIDEO_EXTENSIONS:
+                candidate = UPLOADS_DIR / f"{input_id}{ext}"
+                if candidate.exists():
+                    input_path = video_paths[input_id] = candidate
+                    break
     else:  # skeleton
         candidate = SKELETONS_DIR / f"{input_id}.json"
         if candidate.exists():
@@ -464,29 +713,29 @@ async def start_inference(request: InferenceRequest, background_tasks: Backgroun
     # Create job
     job_id = str(uuid.uuid4())
     
-    with jobs_lock:
-        jobs[job_id] = {
-            "job_id": job_id,
-            "input_id": input_id,
-            "input_type": input_type,
-            "behavior_id": behavior_id,
-            "status": "pending",
-            "progress": 0,
-            "message": "En cola...",
-            "error": None,
-            "results": None,
-            "created_at": datetime.utcnow().isoformat() + "Z",
-        }
+    await job_store.create(job_id, {
+        "job_id": job_id,
+        "input_id": input_id,
+        "input_type": input_type,
+        "behavior_id": behavior_id,
+        "status": "pending",
+        "progress": 0,
+        "message": "En cola...",
+        "error": None,
+        "results": None,
+        "created_at": utcnow_iso(),
+    })
     
     # Start background processing
-    background_tasks.add_task(
-        run_inference, 
-        input_path, 
-        input_type, 
-        behavior_id, 
-        job_id, 
-        input_id
-    )
+    task = asyncio.create_task(run_inference(
+        input_path,
+        input_type,
+        behavior_id,
+        job_id,
+        input_id,
+    ))
+    inference_tasks.add(task)
+    task.add_done_callback(inference_tasks.discard)
     
     return InferenceResponse(job_id=job_id)
 
@@ -494,8 +743,7 @@ async def start_inference(request: InferenceRequest, background_tasks: Backgroun
 @app.get("/api/jobs/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get status of inference job."""
-    with jobs_lock:
-        job = jobs.get(job_id)
+    job = await job_store.get(job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -509,10 +757,12 @@ async def get_job_status(job_id: str):
 
 
 @app.get("/api/jobs/{job_id}/results", response_model=JobResultsResponse)
-async def get_job_results(job_id: str):
-    """Get results of completed inference job."""
-    with jobs_lock:
-        job = jobs.get(job_id)
+async def get_job_results(job_id: str, pretty: bool = False):
+    """
+    Get results of completed inference job.
+    Pass ?pretty=1 for indented JSON.
+    """
+    job = await job_store.get(job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -526,14 +776,12 @@ async def get_job_results(job_id: str):
     results = job.get("results")
     if not results:
         # Try to load from disk
-        results_path = RUNS_DIR / job_id / "results.json"
-        if results_path.exists():
-            with open(results_path, "r", encoding="utf-8") as f:
-                results = json.load(f)
-        else:
+        try:
+            results = await run_in_threadpool(load_json, RUNS_DIR / job_id / "results.json")
+        except FileNotFoundError:
             raise HTTPException(status_code=500, detail="Results not found")
     
-    return JobResultsResponse(
+    response = JobResultsResponse(
         job_id=results["job_id"],
         input_id=results["input_id"],
         input_type=results["input_type"],
@@ -541,16 +789,20 @@ async def get_job_results(job_id: str):
         prediction=PredictionResult(**results["prediction"]),
         metadata=InferenceMetadata(**results["metadata"]),
     )
+    
+    if pretty:
+        return Response(
+            content=orjson.dumps(response.model_dump(), option=orjson.OPT_INDENT_2),
+            media_type="application/json",
+        )
+    
+    return response
 
 
 @app.get("/api/behaviors")
 async def get_behaviors():
     """Get list of all behaviors with their criteria."""
-    return {
-        "behaviors": LABEL_MAP,
-        "count": len(BEHAVIOR_IDS),
-        "ids": BEHAVIOR_IDS,
-    }
+    return Response(content=_BEHAVIORS_PAYLOAD, media_type="application/json")
 
 
 # ============================================
@@ -559,10 +811,19 @@ async def get_behaviors():
 
 if __name__ == "__main__":
     import uvicorn
+    
+    # Each worker has its own in-memory job store, so polls routed to
+    # another worker would 404; sharing jobs needs Redis.
+    workers = int(os.environ.get("DIANA_WORKERS", "1"))
+    if workers > 1 and not REDIS_URL:
+        sys.exit("DIANA_WORKERS > 1 requires DIANA_REDIS_URL")
+    
+    # Set DIANA_RELOAD=1 for auto-reload in development.
     uvicorn.run(
         "main:app",
         host="127.0.0.1",
         port=8000,
-        reload=True,
+        workers=workers,
+        reload=os.environ.get("DIANA_RELOAD", "0") == "1",
         log_level="info",
     )